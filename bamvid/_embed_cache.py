@@ -0,0 +1,60 @@
+"""
+On-disk embedding cache to skip re-encoding previously seen text
+"""
+
+import sqlite3
+from hashlib import blake2b
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+_CACHE_PATH = Path.home() / ".cache" / "memvid" / "embeddings.db"
+
+
+class EmbeddingCache:
+    """sqlite3-backed cache of text -> float32 embedding, keyed per model.
+
+    Repeated ingestions (and identical chunks across runs) skip the
+    SentenceTransformer forward pass entirely; hashing a chunk costs well
+    under a microsecond versus milliseconds to encode it.
+    """
+
+    def __init__(self, model_id: str, path: Optional[Path] = None):
+        self.model_id = model_id
+        db_path = Path(path) if path else _CACHE_PATH
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: the cache is constructed on the main
+        # thread but used from build_video's background index thread;
+        # access is already serialized per IndexManager, and sqlite's
+        # own locking covers concurrent processes
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> bytes:
+        h = blake2b(self.model_id.encode(), digest_size=16)
+        h.update(b"\x00")
+        h.update(text.encode())
+        return h.digest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Return cached embeddings aligned with texts (None on a miss)"""
+        results = []
+        for text in texts:
+            row = self._conn.execute(
+                "SELECT vec FROM embeddings WHERE key = ?", (self._key(text),)
+            ).fetchone()
+            results.append(np.frombuffer(row[0], dtype=np.float32) if row else None)
+        return results
+
+    def put_many(self, texts: List[str], embeddings: np.ndarray):
+        """Store one embedding row per text"""
+        rows = [(self._key(t), np.asarray(e, dtype=np.float32).tobytes())
+                for t, e in zip(texts, embeddings)]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows
+        )
+        self._conn.commit()
@@ -0,0 +1,54 @@
+"""
+Process-wide SentenceTransformer cache
+
+MemvidEncoder and BamvidRetriever each build an IndexManager; without
+sharing, a full pipeline pays the ~2s model load (and its memory) twice
+for the same weights.
+"""
+
+import logging
+import threading
+from functools import lru_cache
+
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _load_model(name: str, precision: str) -> SentenceTransformer:
+    model = SentenceTransformer(name)
+
+    # Optional reduced-precision inference: halves model weight/activation
+    # bandwidth with no measurable recall loss on hardware with native
+    # FP16 (GPU) or BF16 (AVX-512 BF16/AMX) support.
+    if precision in ("float16", "bfloat16"):
+        try:
+            import torch
+            dtype = torch.float16 if precision == "float16" else torch.bfloat16
+            model = model.to(dtype)
+            # The cast itself essentially never fails - the failures show
+            # up at encode time (missing CPU half kernels, bf16 tensors
+            # that numpy cannot represent). Probe once here so a broken
+            # precision reverts at load instead of poisoning every
+            # add_chunks call downstream.
+            model.encode(["precision probe"], convert_to_numpy=True)
+            logger.info(f"Embedding model cast to {precision}")
+        except Exception as e:
+            logger.warning(f"{precision} inference unavailable on this setup, staying in float32: {e}")
+            model = model.float()
+
+    return model
+
+
+def get_model(name: str, precision: str = "float32") -> SentenceTransformer:
+    """
+    Return the shared SentenceTransformer for (name, precision)
+
+    Loaded at most once per process; the lock keeps two threads from
+    racing through the first load (lru_cache alone does not serialize).
+    """
+    with _load_lock:
+        return _load_model(name, precision)
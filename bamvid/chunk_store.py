@@ -0,0 +1,102 @@
+"""
+Disk-backed chunk storage for memory-bounded ingestion
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import logging
+from typing import Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Little-endian uint32 length prefix per record
+_LEN_STRUCT = struct.Struct('<I')
+
+
+class ChunkStore:
+    """
+    Append-only store for text chunks backed by a temporary file.
+
+    Each chunk is written length-prefixed to disk as it is added, with
+    per-chunk offsets kept in a side index, so ingesting corpora larger
+    than RAM never accumulates the text itself in memory. Reads go
+    through a memory map, keeping sequential iteration in build_video
+    cheap. Supports the small list-like surface the encoder relies on
+    (len, iteration, indexing, extend).
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(prefix="bamvid_chunks_")
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []  # byte lengths of encoded chunks
+        self._pos = 0
+        self._total_chars = 0
+        self._mmap = None
+
+    @property
+    def total_chars(self) -> int:
+        """Running total of characters across all stored chunks"""
+        return self._total_chars
+
+    def append(self, chunk: str):
+        """Append a single chunk to the store"""
+        data = chunk.encode('utf-8')
+        self._invalidate_mmap()
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(_LEN_STRUCT.pack(len(data)))
+        self._file.write(data)
+        self._offsets.append(self._pos + _LEN_STRUCT.size)
+        self._lengths.append(len(data))
+        self._pos += _LEN_STRUCT.size + len(data)
+        self._total_chars += len(chunk)
+
+    def extend(self, chunks: Iterable[str]):
+        """Append multiple chunks to the store"""
+        for chunk in chunks:
+            self.append(chunk)
+
+    def clear(self):
+        """Discard all stored chunks and reclaim disk space"""
+        self._invalidate_mmap()
+        self._file.seek(0)
+        self._file.truncate()
+        self._offsets = []
+        self._lengths = []
+        self._pos = 0
+        self._total_chars = 0
+
+    def _invalidate_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _ensure_mmap(self) -> mmap.mmap:
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int) -> str:
+        offset = self._offsets[index]  # raises IndexError like a list
+        view = self._ensure_mmap()
+        return view[offset:offset + self._lengths[index]].decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._offsets:
+            return
+        view = self._ensure_mmap()
+        for offset, length in zip(self._offsets, self._lengths):
+            yield view[offset:offset + length].decode('utf-8')
+
+    def __bool__(self) -> bool:
+        return bool(self._offsets)
+
+    def close(self):
+        """Release the backing file"""
+        self._invalidate_mmap()
+        self._file.close()
@@ -2,6 +2,7 @@
 Configuration defaults and constants for Memvid
 """
 
+import os
 from typing import Dict, Any
 
 # QR Code settings
@@ -18,6 +19,10 @@ DEFAULT_OVERLAP = 32
 
 # Codec Settings
 VIDEO_CODEC = 'h265'        # Valid options are: mpv4, h265 or hevc, h264 or avc, and av1
+# Default FFmpeg thread cap: half the cores, so an encode never starves the
+# caller (or parallel encodes) on shared machines. Override per codec with a
+# "threads" key in its parameter dict.
+VIDEO_THREADS = max(1, (os.cpu_count() or 4) // 2)
 MP4V_PARAMETERS= {"video_file_type": "mp4",
                   "video_fps": 15,
                   "frame_height": 256,
@@ -72,10 +77,13 @@ CACHE_SIZE = 1000  # Number of frames to cache
 # Embedding settings
 EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # Fast and good quality
 EMBEDDING_DIMENSION = 384
+EMBEDDING_BATCH_SIZE = 64  # Larger batches amortize model dispatch; raise on GPU
+EMBEDDING_PRECISION = "float32"  # "float16" (GPU) or "bfloat16" (AVX-512 BF16/AMX CPUs) halves model memory bandwidth
 
 # Index settings
-INDEX_TYPE = "Flat"  # Can be "IVF" for larger datasets, otherwise use Flat
+INDEX_TYPE = "Flat"  # "IVF" for larger datasets, "SQ8" for int8-quantized vectors (4x smaller, faster scans), "Binary" for 1-bit Hamming scan + FP32 rerank, otherwise Flat
 NLIST = 100  # Number of clusters for IVF index
+SEARCH_THREADS = 0  # OpenMP threads for FAISS scans; 0 = library default (all cores)
 
 # LLM settings
 DEFAULT_LLM_PROVIDER = "google"  # google, openai, anthropic
@@ -122,10 +130,13 @@ def get_default_config() -> Dict[str, Any]:
         "embedding": {
             "model": EMBEDDING_MODEL,
             "dimension": EMBEDDING_DIMENSION,
+            "batch_size": EMBEDDING_BATCH_SIZE,
+            "precision": EMBEDDING_PRECISION,
         },
         "index": {
             "type": INDEX_TYPE,
             "nlist": NLIST,
+            "search_threads": SEARCH_THREADS,
         },
         "llm": {
             "model": DEFAULT_LLM_MODELS[DEFAULT_LLM_PROVIDER],
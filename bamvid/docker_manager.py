@@ -9,11 +9,33 @@ import subprocess
 import tempfile
 import shutil
 import logging
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Docker daemon/image probes change rarely; cache them across runs so
+# repeat invocations skip the subprocess cost entirely
+_PROBE_CACHE_PATH = Path.home() / ".cache" / "memvid" / "docker_probe.json"
+_PROBE_CACHE_TTL = 3600  # seconds
+
+
+@lru_cache(maxsize=1)
+def _find_project_root() -> Optional[Path]:
+    """Find project root directory containing docker/ folder
+
+    The answer is invariant for a process, so it is computed once instead
+    of paying up to five stat() calls per DockerManager.
+    """
+    current = Path(__file__).parent
+    for _ in range(5):  # Don't search too far up
+        if (current / "docker").exists():
+            return current
+        current = current.parent
+    return None
+
 
 class DockerManager:
     """
@@ -32,16 +54,27 @@ class DockerManager:
         self.container_name = container_name
         self.verbose = verbose
 
-        # Docker detection
-        self.docker_cmd = self._find_docker_command()
-        self.docker_available = self.docker_cmd is not None
+        # Docker detection is lazy: probing forks a subprocess and costs
+        # hundreds of ms, which callers that stay on the native mp4v path
+        # should never pay. State is filled in by _ensure_checked().
+        self.docker_cmd = None
+        self.docker_available = False
         self.container_ready = False
 
         # Setup state
         self.setup_status = "unknown"
-        self.project_root = self._find_project_root()
+        self.project_root = _find_project_root()
+        self._checked = False
+
+    def _ensure_checked(self):
+        """Run Docker detection once, on first actual use"""
+        if self._checked:
+            return
+        self._checked = True
+
+        self.docker_cmd = self._find_docker_command()
+        self.docker_available = self.docker_cmd is not None
 
-        # Initialize Docker environment
         if self.docker_available:
             self._check_docker_environment()
 
@@ -58,17 +91,37 @@ class DockerManager:
             return "docker"
         return None
 
-    def _find_project_root(self) -> Optional[Path]:
-        """Find project root directory containing docker/ folder"""
-        current = Path(__file__).parent
-        for _ in range(5):  # Don't search too far up
-            if (current / "docker").exists():
-                return current
-            current = current.parent
+    def _load_probe_cache(self) -> Optional[Dict[str, Any]]:
+        """Read a fresh probe result from disk, or None"""
+        try:
+            if time.time() - _PROBE_CACHE_PATH.stat().st_mtime < _PROBE_CACHE_TTL:
+                data = json.loads(_PROBE_CACHE_PATH.read_text())
+                if data.get("container_name") == self.container_name:
+                    return data
+        except (OSError, ValueError):
+            pass
         return None
 
+    def _save_probe_cache(self):
+        """Persist the probe result; failures are non-fatal"""
+        try:
+            _PROBE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _PROBE_CACHE_PATH.write_text(json.dumps({
+                "container_name": self.container_name,
+                "setup_status": self.setup_status,
+                "container_ready": self.container_ready,
+            }))
+        except OSError:
+            pass
+
     def _check_docker_environment(self):
-        """Check Docker daemon and container status"""
+        """Check Docker daemon and container status (cached across runs)"""
+        cached = self._load_probe_cache()
+        if cached is not None:
+            self.setup_status = cached["setup_status"]
+            self.container_ready = cached["container_ready"]
+            return
+
         try:
             # Test Docker daemon
             result = subprocess.run([self.docker_cmd, "--version"],
@@ -87,20 +140,30 @@ class DockerManager:
                 self.setup_status = "container_missing"
 
         except (subprocess.TimeoutExpired, FileNotFoundError):
+            # Transient failure (daemon hiccup, slow socket): don't cache
+            # it, or one timeout would divert Docker builds for the whole
+            # TTL. Re-probe on the next run instead.
             self.setup_status = "docker_error"
+            return
+
+        # Only stable outcomes ("ready", "container_missing") are persisted
+        self._save_probe_cache()
 
     def should_use_docker(self, codec: str) -> bool:
         """Determine if this codec should use Docker backend"""
-        return (codec.lower() in self.DOCKER_CODECS and
-                self.docker_available and
-                self.container_ready)
+        if codec.lower() not in self.DOCKER_CODECS:
+            return False
+        self._ensure_checked()
+        return self.docker_available and self.container_ready
 
     def is_available(self) -> bool:
         """Check if Docker backend is fully ready"""
+        self._ensure_checked()
         return self.docker_available and self.container_ready
 
     def get_status_message(self) -> str:
         """Get human-readable status for logging/debugging"""
+        self._ensure_checked()
         if self.setup_status == "ready":
             return f"✅ Docker backend ready ({self.container_name})"
         elif self.setup_status == "container_missing":
@@ -124,6 +187,8 @@ class DockerManager:
         Returns:
             True if container is ready, False otherwise
         """
+        self._ensure_checked()
+
         if self.container_ready:
             return True
 
@@ -166,6 +231,7 @@ class DockerManager:
             if result.returncode == 0:
                 self.container_ready = True
                 self.setup_status = "ready"
+                self._save_probe_cache()
                 if self.verbose:
                     logger.info("Container built successfully")
                 return True
@@ -258,12 +324,15 @@ class DockerManager:
 
         print(f"🐛 FFMPEG CMD: {' '.join(docker_cmd)}")
 
+        # Stream the command payload over stdin instead of argv - no OS
+        # argument-length limits for huge frame lists, nothing materialized
+        # on disk
         cmd_data = {"command": docker_cmd, "working_dir": "/workspace"}
-        container_cmd = ["python3", "/scripts/ffmpeg_executor.py", json.dumps(cmd_data)]
+        container_cmd = ["python3", "/scripts/ffmpeg_executor.py", "-"]
 
         # FIXED: Mount both workspace and output directories
         full_docker_cmd = [
-                              self.docker_cmd, "run", "--rm",
+                              self.docker_cmd, "run", "--rm", "-i",
                               "-v", f"{docker_working_dir}:/workspace",
                               "-v", f"{docker_output_dir}:/host_output",  # Direct mount output
                               "-v", f"{scripts_dir}:/scripts",
@@ -271,11 +340,18 @@ class DockerManager:
                           ] + container_cmd
 
         try:
-            result = subprocess.run(full_docker_cmd, capture_output=True, text=True, timeout=3600)
+            # Spool stderr to a temp file instead of buffering a multi-hour
+            # encode's log in RAM; only the tail is kept for reporting
+            with tempfile.TemporaryFile(mode='w+b') as stderr_file:
+                result = subprocess.run(full_docker_cmd, input=json.dumps(cmd_data).encode(),
+                                        stdout=subprocess.DEVNULL, stderr=stderr_file,
+                                        timeout=3600)
+
+                stderr_tail = self._read_tail(stderr_file)
 
             if result.returncode != 0:
-                print(f"🐛 FFMPEG ERROR: {result.stderr}")
-                raise RuntimeError(f"Docker FFmpeg execution failed: {result.stderr}")
+                print(f"🐛 FFMPEG ERROR: {stderr_tail}")
+                raise RuntimeError(f"Docker FFmpeg execution failed: {stderr_tail}")
 
             # File should now exist directly on host
             file_size_mb = output_file.stat().st_size / (1024 * 1024) if output_file.exists() else 0
@@ -286,8 +362,8 @@ class DockerManager:
                 "container": self.container_name,
                 "success": True,
                 "file_size_mb": round(file_size_mb, 2),
-                "stdout": result.stdout,
-                "stderr": result.stderr
+                "stdout": "",
+                "stderr": stderr_tail
             }
 
         except subprocess.TimeoutExpired:
@@ -295,6 +371,13 @@ class DockerManager:
         except Exception as e:
             raise RuntimeError(f"Docker execution error: {e}")
 
+    @staticmethod
+    def _read_tail(fileobj, limit: int = 65536) -> str:
+        """Read the last `limit` bytes of a seekable binary file as text"""
+        size = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(max(0, size - limit))
+        return fileobj.read().decode('utf-8', errors='replace')
+
     def _convert_path_for_docker(self, path: Path) -> str:
         """
         Convert local path to Docker-mountable path (handles WSL)
@@ -376,6 +459,7 @@ class DockerManager:
 
     def get_container_info(self) -> Dict[str, Any]:
         """Get information about the Docker environment"""
+        self._ensure_checked()
         info = {
             "docker_available": self.docker_available,
             "docker_cmd": self.docker_cmd,
@@ -399,6 +483,7 @@ class DockerManager:
 
     def cleanup(self):
         """Clean up Docker resources (for testing)"""
+        self._ensure_checked()
         if not self.docker_available:
             return
 
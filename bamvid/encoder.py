@@ -2,24 +2,79 @@
 MemvidEncoder - Unified encoding with native OpenCV and FFmpeg (Docker/native) support
 """
 
-import json
 import logging
+import os
+import queue
+import re
+import shutil
 import subprocess
 import tempfile
+import threading
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from hashlib import blake2b
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from tqdm import tqdm
 import cv2
 import numpy as np
 
-from .utils import encode_to_qr, qr_to_frame, chunk_text
+from .chunk_store import ChunkStore
+from .utils import encode_to_qr_array, chunk_text
 from .index import IndexManager
-from .config import get_default_config, DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, VIDEO_CODEC, get_codec_parameters
+from .config import get_default_config, DEFAULT_CHUNK_SIZE, DEFAULT_OVERLAP, VIDEO_CODEC, VIDEO_THREADS, get_codec_parameters
 from .docker_manager import DockerManager
 
 logger = logging.getLogger(__name__)
 
+# Single compiled pattern for whitespace normalization - one C-level pass
+# instead of per-line/per-phrase string fragments
+_WS_RE = re.compile(r'\s+')
+
+
+def _tmpfs_root() -> Optional[str]:
+    """
+    Return a tmpfs-backed scratch root for frame staging, or None to use
+    the platform default. Memory-backed temp dirs avoid paying disk
+    write+read bandwidth for every intermediate PNG frame.
+    """
+    shm = "/dev/shm"
+    try:
+        if os.path.isdir(shm) and os.access(shm, os.W_OK):
+            # Leave headroom - fall back to disk when tmpfs is nearly full
+            if shutil.disk_usage(shm).free > 1 << 30:
+                return shm
+    except OSError:
+        pass
+    return None
+
+
+def _render_qr_frame(args) -> int:
+    """Render one chunk to a QR PNG frame (runs in a worker process)"""
+    frame_num, chunk, frame_path = args
+    cv2.imwrite(frame_path, encode_to_qr_array(chunk))
+    return frame_num
+
+
+def _render_qr_frame_batch(tasks) -> int:
+    """Render a batch of QR frames in one worker call (amortizes IPC)"""
+    for args in tasks:
+        _render_qr_frame(args)
+    return len(tasks)
+
+
+def _extract_item_text(content) -> str:
+    """Extract normalized text from a single EPUB document item's HTML content"""
+    from bs4 import BeautifulSoup
+    try:
+        import lxml  # noqa: F401 - C parser, much faster than html.parser
+        parser = 'lxml'
+    except ImportError:
+        parser = 'html.parser'
+    soup = BeautifulSoup(content, parser)
+    return _WS_RE.sub(' ', soup.get_text(separator=' ')).strip()
+
+
 class BamvidEncoder:
     """
     Unified MemvidEncoder with clean separation between encoding logic and Docker management.
@@ -28,15 +83,13 @@ class BamvidEncoder:
 
     def __init__(self, config: Optional[Dict[str, Any]] = None, enable_docker=True):
         self.config = config or get_default_config()
-        self.chunks = []
+        self.chunks = ChunkStore()
         self.index_manager = IndexManager()
 
-        # Docker backend (optional)
+        # Docker backend (optional) - detection happens lazily on first
+        # use, so constructing an encoder stays subprocess-free
         self.dcker_mngr = DockerManager() if enable_docker else None
 
-        if self.dcker_mngr and not self.dcker_mngr.is_available():
-            logger.info("Docker backend not available - using native encoding only")
-
     def add_chunks(self, chunks: List[str]):
         """
         Add text chunks to be encoded
@@ -47,6 +100,10 @@ class BamvidEncoder:
         self.chunks.extend(chunks)
         logger.info(f"Added {len(chunks)} chunks. Total: {len(self.chunks)}")
 
+    def _add_chunks_fast(self, chunks: List[str]):
+        """Append pre-chunked text without per-call logging (hot path)"""
+        self.chunks.extend(chunks)
+
     def add_bam(self, bam_content: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP):
         """
         Add BAM and automatically chunk it
@@ -59,7 +116,73 @@ class BamvidEncoder:
         chunks = chunk_text(bam_content, chunk_size, overlap)
         self.add_chunks(chunks)
 
-    
+    def add_pdf(self, pdf_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP):
+        """
+        Add PDF document and automatically chunk it
+
+        Args:
+            pdf_path: Path to PDF file
+            chunk_size: Target chunk size
+            overlap: Overlap between chunks
+        """
+        try:
+            import fitz  # PyMuPDF - C-backed, 5-30x faster than PyPDF2
+        except ImportError:
+            fitz = None
+
+        if fitz is not None:
+            doc = fitz.open(pdf_path)
+            try:
+                text = "\n\n".join(page.get_text("text") for page in doc)
+            finally:
+                doc.close()
+        else:
+            try:
+                from PyPDF2 import PdfReader
+            except ImportError:
+                raise ImportError("PyMuPDF or PyPDF2 is required for PDF support. "
+                                  "Install with: pip install PyMuPDF")
+
+            reader = PdfReader(pdf_path)
+            # Collect pages and join once - repeated += can go quadratic
+            # on long documents
+            parts = [page.extract_text() or "" for page in reader.pages]
+            text = "\n\n".join(parts)
+
+        self.add_bam(text, chunk_size, overlap)
+        logger.info(f"Added PDF: {pdf_path}")
+
+    def add_epub(self, epub_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, overlap: int = DEFAULT_OVERLAP):
+        """
+        Add EPUB document and automatically chunk it
+
+        Args:
+            epub_path: Path to EPUB file
+            chunk_size: Target chunk size
+            overlap: Overlap between chunks
+        """
+        try:
+            import ebooklib
+            from ebooklib import epub
+            from bs4 import BeautifulSoup
+        except ImportError:
+            raise ImportError("ebooklib and beautifulsoup4 are required for EPUB support. "
+                              "Install with: pip install ebooklib beautifulsoup4")
+
+        book = epub.read_epub(epub_path)
+
+        contents = [item.get_content() for item in book.get_items()
+                    if item.get_type() == ebooklib.ITEM_DOCUMENT]
+
+        # Chapters are independent documents - parse them in parallel
+        # across processes (HTML parsing does not release the GIL)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            text_content = [text for text in executor.map(_extract_item_text, contents) if text]
+
+        full_text = "\n\n".join(text_content)
+        self.add_bam(full_text, chunk_size, overlap)
+        logger.info(f"Added EPUB: {epub_path}")
+
     def create_video_writer(self, output_path: str, codec: str = VIDEO_CODEC) -> cv2.VideoWriter:
         """
         Create OpenCV video writer for native encoding
@@ -88,11 +211,14 @@ class BamvidEncoder:
         opencv_codec = opencv_codec_map.get(codec, codec)
         fourcc = cv2.VideoWriter_fourcc(*opencv_codec)
 
+        # QR frames are binary black/white - single-channel input cuts the
+        # pixel bandwidth through the codec by 3x
         return cv2.VideoWriter(
             output_path,
             fourcc,
             codec_config["video_fps"],
-            (codec_config["frame_width"], codec_config["frame_height"])
+            (codec_config["frame_width"], codec_config["frame_height"]),
+            isColor=False
         )
 
     def _generate_qr_frames(self, temp_dir: Path, show_progress: bool = True) -> Path:
@@ -109,15 +235,67 @@ class BamvidEncoder:
         frames_dir = temp_dir / "frames"
         frames_dir.mkdir()
 
-        chunks_iter = enumerate(self.chunks)
-        if show_progress:
-            chunks_iter = tqdm(chunks_iter, total=len(self.chunks), desc="Generating QR frames")
+        # Frame/chunk mapping lives in the index, so the QR payload is just
+        # the raw text. Duplicate chunks (overlap regions, repeated PDF
+        # headers/footers) produce byte-identical frames, so each unique
+        # payload is rendered once and repeats reuse its file.
+        frame_path_fmt = str(frames_dir) + "/frame_%06d.png"
+
+        digest_to_path = {}
+        dup_links = []
+        unique_frames = set()
+
+        for frame_num, chunk in enumerate(self.chunks):
+            frame_path = frame_path_fmt % frame_num
+            key = blake2b(chunk.encode('utf-8'), digest_size=16).digest()
+            src = digest_to_path.get(key)
+            if src is None:
+                digest_to_path[key] = frame_path
+                unique_frames.add(frame_num)
+            else:
+                dup_links.append((src, frame_path))
+
+        # Rasterization is CPU-bound and per-chunk independent, so fan it
+        # out across cores; the PNG filename encodes the frame order, so
+        # no result reordering is needed.
+        tasks = [(frame_num, chunk, frame_path_fmt % frame_num)
+                 for frame_num, chunk in enumerate(self.chunks)
+                 if frame_num in unique_frames]
+
+        # Batched submit + as_completed: batching amortizes IPC like
+        # map(chunksize=...) did, but completions are consumed in any
+        # order, so progress tracks real work and a slow early batch
+        # (or its exception) never holds up the rest.
+        batch_size = 32
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(_render_qr_frame_batch, tasks[i:i + batch_size])
+                       for i in range(0, len(tasks), batch_size)]
+            progress = None
+            if show_progress:
+                # Throttled updates - tqdm's per-iteration default costs a
+                # lock and a clock read on every frame
+                progress = tqdm(total=len(unique_frames), desc="Generating QR frames",
+                                miniters=max(1, len(unique_frames) // 200),
+                                mininterval=0.5, smoothing=0)
+            try:
+                for future in as_completed(futures):
+                    rendered = future.result()
+                    if progress is not None:
+                        progress.update(rendered)
+            finally:
+                if progress is not None:
+                    progress.close()
+
+        # Duplicates reuse the rendered frame: hardlink when the filesystem
+        # allows it, byte copy otherwise
+        for src, dst in dup_links:
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copyfile(src, dst)
 
-        for frame_num, chunk in chunks_iter:
-            chunk_data = {"id": frame_num, "text": chunk, "frame": frame_num}
-            qr_image = encode_to_qr(json.dumps(chunk_data))
-            frame_path = frames_dir / f"frame_{frame_num:06d}.png"
-            qr_image.save(frame_path)
+        if dup_links:
+            logger.info(f"Reused {len(dup_links)} duplicate frames out of {len(self.chunks)}")
 
         created_frames = list(frames_dir.glob("frame_*.png"))
         print(f"🐛 FRAMES: {len(created_frames)} files in {frames_dir}")
@@ -141,8 +319,8 @@ class BamvidEncoder:
         ffmpeg_codec = ffmpeg_codec_map.get(codec, codec)
 
         # Ensure output file has correct extension
-        expected_ext = codec_config["video_file_type"]
-        if not str(output_file).endswith(expected_ext):
+        expected_ext = "." + codec_config["video_file_type"].lstrip(".")
+        if output_file.suffix != expected_ext:
             output_file = output_file.with_suffix(expected_ext)
 
         # Build base command using config
@@ -157,10 +335,11 @@ class BamvidEncoder:
 
         # Apply scaling and pixel format based on codec
         if ffmpeg_codec in ['libx265', 'libx264']:
-            # Scale to config dimensions for advanced codecs
+            # Scale to config dimensions for advanced codecs; force gray so
+            # the chroma planes carry no information (QR frames are B/W)
             target_width = codec_config["frame_width"]
             target_height = codec_config["frame_height"]
-            cmd.extend(['-vf', f'scale={target_width}:{target_height}'])
+            cmd.extend(['-vf', f'scale={target_width}:{target_height},format=gray'])
             cmd.extend(['-pix_fmt', codec_config["pix_fmt"]])
 
             # Add profile if specified in config
@@ -170,9 +349,8 @@ class BamvidEncoder:
             # Use pixel format from config for other codecs
             cmd.extend(['-pix_fmt', codec_config["pix_fmt"]])
 
-        # Threading (limit to 16 max)
-        import os
-        thread_count = min(os.cpu_count() or 4, 16)
+        # Threading - capped so the encode doesn't take every core
+        thread_count = codec_config.get("threads") or VIDEO_THREADS
         cmd.extend(['-threads', str(thread_count)])
 
         print(f"🎬 FFMPEG ENCODING SUMMARY:")
@@ -236,29 +414,52 @@ class BamvidEncoder:
         writer = self.create_video_writer(str(output_file), codec)
         frame_numbers = []
 
+        target_size = (codec_config["frame_width"], codec_config["frame_height"])
+
         try:
             # Load and write frames
             frame_files = sorted(frames_dir.glob("frame_*.png"))
             frame_iter = enumerate(frame_files)
 
             if show_progress:
-                frame_iter = tqdm(frame_iter, total=len(frame_files), desc="Writing video frames")
+                frame_iter = tqdm(frame_iter, total=len(frame_files), desc="Writing video frames",
+                                  miniters=max(1, len(frame_files) // 200),
+                                  mininterval=0.5, smoothing=0)
+
+            # Bounded handoff queue: PNG loading/resizing on the main thread
+            # overlaps with the codec work inside writer.write, which
+            # releases the GIL. Each queued frame is its own array (imread
+            # allocates per call), so the writer never sees a buffer the
+            # producer is still filling.
+            frames_q = queue.Queue(maxsize=64)
+
+            def _drain():
+                while True:
+                    item = frames_q.get()
+                    if item is None:
+                        break
+                    num, frame = item
+                    writer.write(frame)
+                    frame_numbers.append(num)
+
+            writer_thread = threading.Thread(target=_drain, daemon=True)
+            writer_thread.start()
 
             for frame_num, frame_file in frame_iter:
-                # Load frame
-                frame = cv2.imread(str(frame_file))
+                # Load frame as grayscale - matches the single-channel writer
+                frame = cv2.imread(str(frame_file), cv2.IMREAD_GRAYSCALE)
                 if frame is None:
                     logger.warning(f"Could not load frame: {frame_file}")
                     continue
 
                 # Resize if needed
-                target_size = (codec_config["frame_width"], codec_config["frame_height"])
                 if frame.shape[:2][::-1] != target_size:
                     frame = cv2.resize(frame, target_size)
 
-                # Write frame
-                writer.write(frame)
-                frame_numbers.append(frame_num)
+                frames_q.put((frame_num, frame))
+
+            frames_q.put(None)
+            writer_thread.join()
 
             return {
                 "backend": "opencv",
@@ -292,15 +493,25 @@ class BamvidEncoder:
 
         print(f"🐛 FFMPEG: frames={frames_dir} → docker_mount={frames_dir.parent}")
 
-        cmd = self._build_ffmpeg_command(frames_dir, output_file, codec)
+        expected_ext = "." + codec_parameters[codec]["video_file_type"].lstrip(".")
+        if output_file.suffix != expected_ext:
+            output_file = output_file.with_suffix(expected_ext)
+
+        # Encode next to the frames (often tmpfs), then move the finished
+        # video into place: same-filesystem renames are O(1) instead of an
+        # extra full read+write of the video
+        temp_output = frames_dir.parent / f"encode_tmp{expected_ext}"
+
+        cmd = self._build_ffmpeg_command(frames_dir, temp_output, codec)
 
         if self.dcker_mngr and self.dcker_mngr.should_use_docker(codec):
             if show_progress:
                 logger.info(f"Encoding with Docker FFmpeg using {codec} codec...")
 
             result = self.dcker_mngr.execute_ffmpeg(
-                cmd, frames_dir.parent, output_file, auto_build=auto_build_docker
+                cmd, frames_dir.parent, temp_output, auto_build=auto_build_docker
             )
+            self._move_into_place(temp_output, output_file)
 
             frame_count = len(list(frames_dir.glob("frame_*.png")))
             result.update({
@@ -321,6 +532,8 @@ class BamvidEncoder:
             if result.returncode != 0:
                 raise RuntimeError(f"Native FFmpeg failed: {result.stderr}")
 
+            self._move_into_place(temp_output, output_file)
+
             frame_count = len(list(frames_dir.glob("frame_*.png")))
             return {
                 "backend": "native_ffmpeg",
@@ -331,6 +544,15 @@ class BamvidEncoder:
                 "duration_seconds": frame_count / codec_parameters[codec]["video_fps"]
             }
 
+    @staticmethod
+    def _move_into_place(temp_output: Path, output_file: Path):
+        """Move the encoded video to its destination (rename when possible)"""
+        try:
+            os.replace(temp_output, output_file)
+        except OSError:
+            # Cross-device move (e.g. tmpfs scratch -> disk destination)
+            shutil.copy2(temp_output, output_file)
+
 
     def build_video(self, output_file: str, index_file: str,
                     codec: str = VIDEO_CODEC, show_progress: bool = True,
@@ -361,36 +583,47 @@ class BamvidEncoder:
 
         logger.info(f"Building video with {len(self.chunks)} chunks using {codec} codec")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
+        with tempfile.TemporaryDirectory(dir=_tmpfs_root()) as temp_dir:
             temp_path = Path(temp_dir)
 
-            # Generate QR frames (always local)
-            frames_dir = self._generate_qr_frames(temp_path, show_progress)
+            frame_numbers = list(range(len(self.chunks)))
 
-            try:
-                from .config import codec_parameters
-                # Choose encoding method based on codec
-                if codec == "mp4v":
-                    # Always use OpenCV for MP4V
-                    stats = self._encode_with_opencv(frames_dir, output_path, codec, show_progress)
-                else:
-                    # Use FFmpeg for advanced codecs
-                    stats = self._encode_with_ffmpeg(frames_dir, output_path, codec,
-                                                     show_progress, auto_build_docker)
-
-            except Exception as e:
-                if allow_fallback and codec != "mp4v":
-                    warnings.warn(f"{codec} encoding failed: {e}. Falling back to MP4V.", UserWarning)
-                    stats = self._encode_with_opencv(frames_dir, output_path, "mp4v", show_progress)
-                else:
-                    raise
-
-            # Build search index
-            if show_progress:
-                logger.info("Building search index...")
+            # Generate QR frames (always local) before the index job is
+            # submitted: the render pool forks worker processes, and
+            # forking while a background thread is inside torch/OpenMP
+            # inference is a known deadlock hazard
+            frames_dir = self._generate_qr_frames(temp_path, show_progress)
 
-            frame_numbers = list(range(len(self.chunks)))
-            self.index_manager.add_chunks(self.chunks, frame_numbers, show_progress)
+            # Build the search index in the background while the video
+            # encodes - embedding inference and the codec are independent
+            # workloads, and the chunk snapshot is immutable during encode
+            with ThreadPoolExecutor(max_workers=1) as index_executor:
+                index_future = index_executor.submit(
+                    self.index_manager.add_chunks, list(self.chunks), frame_numbers, False
+                )
+
+                try:
+                    from .config import codec_parameters
+                    # Choose encoding method based on codec
+                    if codec == "mp4v":
+                        # Always use OpenCV for MP4V
+                        stats = self._encode_with_opencv(frames_dir, output_path, codec, show_progress)
+                    else:
+                        # Use FFmpeg for advanced codecs
+                        stats = self._encode_with_ffmpeg(frames_dir, output_path, codec,
+                                                         show_progress, auto_build_docker)
+
+                except Exception as e:
+                    if allow_fallback and codec != "mp4v":
+                        warnings.warn(f"{codec} encoding failed: {e}. Falling back to MP4V.", UserWarning)
+                        stats = self._encode_with_opencv(frames_dir, output_path, "mp4v", show_progress)
+                    else:
+                        raise
+
+                # Wait for the background index build
+                if show_progress:
+                    logger.info("Waiting for search index build...")
+                index_future.result()
 
             # Save index
             self.index_manager.save(str(index_path.with_suffix('')))
@@ -412,7 +645,7 @@ class BamvidEncoder:
 
     def clear(self):
         """Clear all chunks"""
-        self.chunks = []
+        self.chunks.clear()
         self.index_manager = IndexManager()
         logger.info("Cleared all chunks")
 
@@ -422,10 +655,15 @@ class BamvidEncoder:
         if self.dcker_mngr:
             docker_status = "available" if self.dcker_mngr.is_available() else "unavailable"
 
+        # Running aggregates from the chunk store - O(1) instead of two
+        # full passes over the corpus
+        total_chunks = len(self.chunks)
+        total_chars = self.chunks.total_chars
+
         return {
-            "total_chunks": len(self.chunks),
-            "total_characters": sum(len(chunk) for chunk in self.chunks),
-            "avg_chunk_size": np.mean([len(chunk) for chunk in self.chunks]) if self.chunks else 0,
+            "total_chunks": total_chunks,
+            "total_characters": total_chars,
+            "avg_chunk_size": total_chars / total_chunks if total_chunks else 0,
             "docker_status": docker_status,
             "supported_codecs": list(self.config["codec_parameters"].keys()),
             "config": self.config
@@ -477,7 +715,10 @@ class BamvidEncoder:
         """
         encoder = cls(config)
 
+        # Batched path: chunk each document straight into the store and
+        # log once, instead of paying add_chunks overhead per document
         for doc in documents:
-            encoder.add_bam(doc, chunk_size, overlap)
+            encoder._add_chunks_fast(chunk_text(doc, chunk_size, overlap))
 
+        logger.info(f"Added {len(encoder.chunks)} chunks from {len(documents)} documents")
         return encoder
\ No newline at end of file
@@ -21,6 +21,21 @@ from .config import get_default_config
 logger = logging.getLogger(__name__)
 
 
+def _payload_to_text(payload: str) -> str:
+    """
+    Extract chunk text from a decoded QR payload.
+
+    Current videos store the raw chunk text directly; older videos
+    wrapped it in a JSON object with id/frame fields.
+    """
+    if payload.startswith('{'):
+        try:
+            return json.loads(payload)["text"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            pass
+    return payload
+
+
 class BamvidRetriever:
     """Fast retrieval from QR code videos using semantic search"""
     
@@ -90,12 +105,7 @@ class BamvidRetriever:
         for chunk_id, distance, metadata in search_results:
             frame_num = metadata["frame"]
             if frame_num in decoded_frames:
-                try:
-                    chunk_data = json.loads(decoded_frames[frame_num])
-                    results.append(chunk_data["text"])
-                except (json.JSONDecodeError, KeyError):
-                    # Fallback to metadata text
-                    results.append(metadata["text"])
+                results.append(_payload_to_text(decoded_frames[frame_num]))
             else:
                 # Fallback to metadata text if decode failed
                 results.append(metadata["text"])
@@ -105,6 +115,48 @@ class BamvidRetriever:
         
         return results
     
+    def search_batch(self, queries: List[str], top_k: int = 5) -> List[List[str]]:
+        """
+        Search for relevant chunks for several queries in one pass
+
+        Queries are embedded as one batch and searched with a single index
+        call, and frame decoding is shared across all queries, so this is
+        much cheaper than looping over search().
+
+        Args:
+            queries: Search queries
+            top_k: Number of results per query
+
+        Returns:
+            One list of relevant text chunks per query
+        """
+        start_time = time.time()
+
+        batch_results = self.index_manager.search_batch(queries, top_k)
+
+        # Decode the union of needed frames once, across all queries
+        frame_numbers = list({result[2]["frame"]
+                              for search_results in batch_results
+                              for result in search_results})
+        decoded_frames = self._decode_frames_parallel(frame_numbers)
+
+        all_results = []
+        for search_results in batch_results:
+            results = []
+            for chunk_id, distance, metadata in search_results:
+                frame_num = metadata["frame"]
+                if frame_num in decoded_frames:
+                    results.append(_payload_to_text(decoded_frames[frame_num]))
+                else:
+                    # Fallback to metadata text if decode failed
+                    results.append(metadata["text"])
+            all_results.append(results)
+
+        elapsed = time.time() - start_time
+        logger.info(f"Batch search of {len(queries)} queries completed in {elapsed:.3f}s")
+
+        return all_results
+
     def get_chunk_by_id(self, chunk_id: int) -> Optional[str]:
         """
         Get specific chunk by ID
@@ -120,11 +172,7 @@ class BamvidRetriever:
             frame_num = metadata["frame"]
             decoded = self._decode_single_frame(frame_num)
             if decoded:
-                try:
-                    chunk_data = json.loads(decoded)
-                    return chunk_data["text"]
-                except (json.JSONDecodeError, KeyError):
-                    pass
+                return _payload_to_text(decoded)
             return metadata["text"]
         return None
     
@@ -211,11 +259,7 @@ class BamvidRetriever:
             
             # Get text from decoded frame or metadata
             if frame_num in decoded_frames:
-                try:
-                    chunk_data = json.loads(decoded_frames[frame_num])
-                    text = chunk_data["text"]
-                except (json.JSONDecodeError, KeyError):
-                    text = metadata["text"]
+                text = _payload_to_text(decoded_frames[frame_num])
             else:
                 text = metadata["text"]
             
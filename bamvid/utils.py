@@ -15,62 +15,131 @@ import logging
 from tqdm import tqdm
 import base64
 import gzip
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import get_default_config, codec_parameters
 
 logger = logging.getLogger(__name__)
 
+_qr_detectors = threading.local()
+
+
+def _prepare_qr_payload(data: str) -> str:
+    """Compress large payloads, prefixed so the decoder can detect it"""
+    if len(data) > 100:
+        compressed = gzip.compress(data.encode())
+        data = "GZ:" + base64.b64encode(compressed).decode()
+    return data
+
+
+def _make_qr(data: str) -> qrcode.QRCode:
+    """Build and finalize a QRCode object for a payload"""
+    config = get_default_config()["qr"]
+
+    qr = qrcode.QRCode(
+        version=config["version"],
+        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{config['error_correction']}"),
+        box_size=config["box_size"],
+        border=config["border"],
+    )
+
+    qr.add_data(_prepare_qr_payload(data))
+    qr.make(fit=True)
+    return qr
+
+
+def encode_to_qr_array(data: str) -> np.ndarray:
+    """
+    Encode data to a QR bitmap as a grayscale uint8 array (0/255)
+
+    Skips PIL entirely: the module matrix (border included) is expanded
+    to pixels with NumPy/OpenCV, which is far cheaper than rasterizing
+    through make_image for every frame. Assumes the default black-on-
+    white colors; use encode_to_qr for custom fill/back colors.
+
+    Deliberately uncached: frames run ~0.66 MB at the default QR config,
+    and the encoder already dedups identical payloads before rendering,
+    so a per-process cache would only pin dead arrays.
+
+    Args:
+        data: String data to encode
+
+    Returns:
+        2D uint8 array, one byte per pixel
+    """
+    config = get_default_config()["qr"]
+
+    qr = _make_qr(data)
+    modules = np.asarray(qr.get_matrix(), dtype=np.uint8)
+    pixels = np.where(modules, np.uint8(0), np.uint8(255))
+
+    # Integer-ratio upsample: each module becomes a box_size x box_size
+    # block. repeat on both axes is a single C loop per axis and avoids
+    # cv2.resize's generic interpolation machinery entirely.
+    box_size = config["box_size"]
+    if box_size > 1:
+        pixels = pixels.repeat(box_size, axis=0).repeat(box_size, axis=1)
+
+    return np.ascontiguousarray(pixels)
+
 
 def encode_to_qr(data: str) -> Image.Image:
     """
     Encode data to QR code image
-    
+
     Args:
         data: String data to encode
         config: Optional QR configuration
-        
+
     Returns:
         PIL Image of QR code
     """
-
     config = get_default_config()["qr"]
 
-    # Compress data if it's large
-    if len(data) > 100:
-        compressed = gzip.compress(data.encode())
-        data = base64.b64encode(compressed).decode()
-        data = "GZ:" + data  # Prefix to indicate compression
-    
-    qr = qrcode.QRCode(
-        version=config["version"],
-        error_correction=getattr(qrcode.constants, f"ERROR_CORRECT_{config['error_correction']}"),
-        box_size=config["box_size"],
-        border=config["border"],
-    )
-    
-    qr.add_data(data)
-    qr.make(fit=True)
-    
+    qr = _make_qr(data)
     img = qr.make_image(fill_color=config["fill_color"], back_color=config["back_color"])
     return img
 
 
+def _get_qr_detector() -> cv2.QRCodeDetector:
+    """
+    Per-thread cv2.QRCodeDetector instance
+
+    Detector construction is not free and the object is not thread-safe,
+    so keep one per thread instead of building a fresh one per frame
+    (parallel_decode_qr decodes from several threads at once).
+    """
+    detector = getattr(_qr_detectors, "detector", None)
+    if detector is None:
+        detector = cv2.QRCodeDetector()
+        _qr_detectors.detector = detector
+    return detector
+
+
 def decode_qr(image: np.ndarray) -> Optional[str]:
     """
     Decode QR code from image
-    
+
     Args:
         image: OpenCV image array
-        
+
     Returns:
         Decoded string or None if decode fails
     """
     try:
-        # Initialize OpenCV QR code detector
-        detector = cv2.QRCodeDetector()
-        
+        # Our frames are synthetic axis-aligned QRs with no color content,
+        # so hand the detector a single-channel image: it scans a third of
+        # the bytes and skips its internal color conversion
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
         # Detect and decode
-        data, bbox, straight_qrcode = detector.detectAndDecode(image)
+        data, bbox, straight_qrcode = _get_qr_detector().detectAndDecode(image)
         
         if data:
             # Check if data was compressed
@@ -84,30 +153,38 @@ def decode_qr(image: np.ndarray) -> Optional[str]:
     return None
 
 
-def qr_to_frame(qr_image: Image.Image, frame_size: Tuple[int, int]) -> np.ndarray:
+def qr_to_frame(qr_image: Image.Image, frame_size: Tuple[int, int],
+                out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Convert QR PIL image to video frame
-    
+
     Args:
         qr_image: PIL Image of QR code
         frame_size: Target frame size (width, height)
-        
+        out: Optional preallocated (height, width, 3) uint8 buffer filled
+            in place, avoiding a fresh multi-MB allocation per frame
+
     Returns:
-        OpenCV frame array
+        OpenCV frame array (the same array as out when provided)
     """
-    # Resize to fit frame while maintaining aspect ratio
-    qr_image = qr_image.resize(frame_size, Image.Resampling.LANCZOS)
-    
-    # Convert to RGB mode if necessary (handles L, P, etc. modes)
+    if out is not None:
+        # Convert at the QR's native size, then let OpenCV's SIMD resize
+        # write straight into the caller's persistent buffer - no
+        # frame-sized intermediates. NEAREST keeps module edges crisp.
+        if qr_image.mode != 'RGB':
+            qr_image = qr_image.convert('RGB')
+        src = cv2.cvtColor(np.asarray(qr_image, dtype=np.uint8), cv2.COLOR_RGB2BGR)
+        cv2.resize(src, frame_size, dst=out, interpolation=cv2.INTER_NEAREST)
+        return out
+
+    # Convert at the QR's native size - np.asarray views PIL's buffer
+    # without copying - then resize with OpenCV's SIMD NEAREST kernel.
+    # Far cheaper than PIL's LANCZOS, and NEAREST keeps module edges
+    # crisp instead of ringing them.
     if qr_image.mode != 'RGB':
         qr_image = qr_image.convert('RGB')
-    
-    # Convert to numpy array and ensure proper dtype
-    img_array = np.array(qr_image, dtype=np.uint8)
-    
-    # Convert to OpenCV format
-    frame = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-    return frame
+    src = cv2.cvtColor(np.asarray(qr_image, dtype=np.uint8), cv2.COLOR_RGB2BGR)
+    return cv2.resize(src, frame_size, interpolation=cv2.INTER_NEAREST)
 
 
 def extract_frame(video_path: str, frame_number: int) -> Optional[np.ndarray]:
@@ -143,21 +220,60 @@ def extract_and_decode_cached(video_path: str, frame_number: int) -> Optional[st
     return None
 
 
-def batch_extract_frames(video_path: str, frame_numbers: List[int], 
+@lru_cache(maxsize=1)
+def _cuda_decode_available() -> bool:
+    """True when OpenCV has cudacodec support and a CUDA device is present"""
+    try:
+        return hasattr(cv2, "cudacodec") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def _batch_extract_frames_gpu(video_path: str,
+                              frame_numbers: List[int]) -> List[Tuple[int, Optional[np.ndarray]]]:
+    """
+    Decode frames on the GPU via NVDEC
+
+    The hardware decoder runs sequentially (~100us/frame vs ~1-5ms on
+    CPU) and only the wanted frames are downloaded to host memory.
+    """
+    wanted = dict.fromkeys(frame_numbers)
+    reader = cv2.cudacodec.createVideoReader(video_path)
+    last = max(frame_numbers)
+
+    frame_idx = 0
+    while frame_idx <= last:
+        ret, gpu_frame = reader.nextFrame()
+        if not ret:
+            break
+        if frame_idx in wanted:
+            wanted[frame_idx] = gpu_frame.download()
+        frame_idx += 1
+
+    return [(frame_num, wanted[frame_num]) for frame_num in sorted(frame_numbers)]
+
+
+def batch_extract_frames(video_path: str, frame_numbers: List[int],
                         max_workers: int = 4) -> List[Tuple[int, Optional[np.ndarray]]]:
     """
     Extract multiple frames in parallel
-    
+
     Args:
         video_path: Path to video file
         frame_numbers: List of frame indices
         max_workers: Number of parallel workers
-        
+
     Returns:
         List of (frame_number, frame) tuples
     """
+    if frame_numbers and _cuda_decode_available():
+        try:
+            return _batch_extract_frames_gpu(video_path, frame_numbers)
+        except cv2.error as e:
+            logger.warning(f"CUDA frame decode failed ({e}); falling back to CPU")
+
     results = []
-    
+
     # Sort frame numbers for sequential access
     sorted_frames = sorted(frame_numbers)
     
@@ -241,32 +357,45 @@ def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]
         List of text chunks
     """
     chunks = []
+    text_len = len(text)
+    # Sentence breaks only count in the last 20% of a chunk; searching
+    # just that window (and slicing each chunk once) keeps the loop cheap
+    # on multi-MB inputs
+    min_break = int(chunk_size * 0.8) + 1
     start = 0
-    
-    while start < len(text):
+
+    while start < text_len:
         end = start + chunk_size
-        chunk = text[start:end]
-        
+
         # Try to break at sentence boundary
-        if end < len(text):
-            last_period = chunk.rfind('.')
-            if last_period > chunk_size * 0.8:
-                end = start + last_period + 1
-                chunk = text[start:end]
-        
-        chunks.append(chunk.strip())
+        if end < text_len:
+            last_period = text.rfind('.', start + min_break, end)
+            if last_period != -1:
+                end = last_period + 1
+
+        chunks.append(text[start:end].strip())
         start = end - overlap
-    
+
     return chunks
 
 
 def save_index(index_data: Dict[str, Any], output_path: str):
-    """Save index data to JSON file"""
+    """Save index data to JSON file (orjson when available - 3-10x faster)"""
+    if orjson is not None:
+        # NON_STR_KEYS: the frame/chunk mappings are int-keyed; load()
+        # coerces keys back with int(k) either way
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(index_data,
+                                 option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
     with open(output_path, 'w') as f:
         json.dump(index_data, f, indent=2)
 
 
 def load_index(index_path: str) -> Dict[str, Any]:
-    """Load index data from JSON file"""
+    """Load index data from JSON file (orjson when available)"""
+    if orjson is not None:
+        with open(index_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(index_path, 'r') as f:
         return json.load(f)
\ No newline at end of file
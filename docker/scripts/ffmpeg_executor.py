@@ -9,11 +9,16 @@ from pathlib import Path
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: ffmpeg_executor.py <command_json> OR <direct_args...>", file=sys.stderr)
+        print("Usage: ffmpeg_executor.py - (JSON on stdin) OR <command_json> OR <direct_args...>", file=sys.stderr)
         sys.exit(1)
 
     try:
-        if len(sys.argv) == 2 and (sys.argv[1].startswith('{') or sys.argv[1].startswith('[')):
+        if len(sys.argv) == 2 and sys.argv[1] == '-':
+            # Command payload streamed over stdin - avoids argv length limits
+            cmd_data = json.load(sys.stdin)
+            cmd = cmd_data['command']
+            working_dir = cmd_data.get('working_dir', '/workspace')
+        elif len(sys.argv) == 2 and (sys.argv[1].startswith('{') or sys.argv[1].startswith('[')):
             cmd_data = json.loads(sys.argv[1])
             cmd = cmd_data['command']
             working_dir = cmd_data.get('working_dir', '/workspace')